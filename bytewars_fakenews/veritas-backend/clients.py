@@ -0,0 +1,21 @@
+import os
+from functools import lru_cache
+
+import google.generativeai as genai
+
+# Shared API clients: each factory builds its client once per process and
+# every later call returns the cached instance
+
+@lru_cache(maxsize=None)
+def configure_gemini() -> None:
+    """Configure the Gemini SDK from GEMINI_API_KEY"""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY is required")
+    genai.configure(api_key=api_key)
+
+@lru_cache(maxsize=None)
+def get_gemini_model(model_name: str) -> genai.GenerativeModel:
+    """Return the shared GenerativeModel for model_name"""
+    configure_gemini()
+    return genai.GenerativeModel(model_name)
@@ -1,49 +1,266 @@
-import json
+import difflib
+import orjson
 import re
+from functools import lru_cache
+from typing import Optional
 
-def clean_json_response(response_text: str) -> str:
+# Code-fence stripper (```json or bare ```), compiled once at import time
+_CODE_FENCE_RE = re.compile(r'```(?:json)?\s*')
+
+# Substrings without which text can't contain JSON objects, arrays, keys or code fences
+_JSON_MARKERS = ('{', '[', '`', '":')
+
+# Characters that are replaced by whitespace outside of JSON objects/arrays
+_JSON_PUNCTUATION = ':,{}[]"'
+_JSON_PUNCTUATION_TABLE = str.maketrans({ch: ' ' for ch in _JSON_PUNCTUATION})
+
+# Structural characters for bracket matching: string delimiters, escapes and brackets
+_BRACKET_SCAN_RE = re.compile(r'[\\"{}\[\]]')
+
+class _BracketMatcher:
+    """
+    Finds the closing index of each '{' / '[' outside strings, or -1 if it is never
+    closed. Matching runs lazily, only as far into the text as the questions asked
+    require, and the regex visits structural characters only. A closer that doesn't
+    match the innermost open bracket is ignored
+    """
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._matches = _BRACKET_SCAN_RE.finditer(text)
+        self._closing: dict[int, int] = {}
+        self._stack: list[int] = []
+        self._in_string = False
+        self._skip_to = 0  # an escaped character inside a string is not structural
+
+    def closing(self, start: int) -> int:
+        """Index of the bracket that closes the opener at start, or -1"""
+        while start not in self._closing:
+            self._advance()
+        return self._closing[start]
+
+    def _advance(self) -> None:
+        match = next(self._matches, None)
+        if match is None:
+            for i in self._stack:
+                self._closing[i] = -1
+            self._stack.clear()
+            return
+        i = match.start()
+        if i < self._skip_to:
+            return
+        ch = self._text[i]
+        if self._in_string:
+            if ch == '\\':
+                self._skip_to = i + 2
+            elif ch == '"':
+                self._in_string = False
+        elif ch == '"':
+            self._in_string = True
+        elif ch == '{' or ch == '[':
+            self._stack.append(i)
+        elif ch == '}' or ch == ']':
+            stack = self._stack
+            if stack and self._text[stack[-1]] == ('{' if ch == '}' else '['):
+                self._closing[stack.pop()] = i
+
+def _strip_json_artifacts(text: str, limit: int = -1) -> str:
+    """
+    Remove JSON objects, arrays, keys and punctuation in a single pass, collapsing
+    runs of whitespace as it goes. Closed objects/arrays are dropped whole; a
+    never-closed one (truncated LLM output) only loses its bracket, so its contents
+    are cleaned like the surrounding text. With limit >= 0 the scan stops at the
+    first word break past limit chars, and brackets are matched no further than
+    the scan needs (an opener that is never closed is only known at the end of text)
+    """
+    # Without objects, arrays or strings there is nothing to track: a C-level
+    # translate + split/join does the punctuation and whitespace work
+    if '{' not in text and '[' not in text and '"' not in text:
+        return ' '.join(text.translate(_JSON_PUNCTUATION_TABLE).split())
+    
+    brackets = _BracketMatcher(text)
+    out: list[str] = []
+    out_len = 0
+    in_string = False
+    escaped = False
+    string_chars: list[str] = []
+    pending_key = False  # a string just closed; dropped if a ':' follows
+    prev_space = True
+    i = 0
+    n = len(text)
+
+    while i < n:
+        ch = text[i]
+        i += 1
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                pending_key = True
+                continue
+            string_chars.append(ch)
+            continue
+
+        if pending_key:
+            if ch == ':':
+                pending_key = False
+                continue
+            if ch.isspace():
+                continue
+            # Not a key: keep the string contents as plain words
+            pending_key = False
+            words = ''.join(string_chars).split()
+            if words:
+                if not prev_space:
+                    out.append(' ')
+                    out_len += 1
+                joined = ' '.join(words)
+                out.append(joined)
+                out_len += len(joined)
+                # The closing quote is a word break (the whitespace after it was consumed above)
+                if 0 <= limit <= out_len:
+                    return ''.join(out).strip()
+                out.append(' ')
+                out_len += 1
+                prev_space = True
+
+        if ch == '{' or ch == '[':
+            end = brackets.closing(i - 1)
+            if end >= 0:
+                i = end + 1
+                continue
+            # Never closed: the bracket acts as a word break, like punctuation
+
+        if ch == '"':
+            in_string = True
+            string_chars.clear()
+        elif ch.isspace() or ch in _JSON_PUNCTUATION:
+            if not prev_space:
+                # Checked only at word breaks, so the per-character path stays branch-free
+                if 0 <= limit <= out_len:
+                    return ''.join(out).strip()
+                out.append(' ')
+                out_len += 1
+                prev_space = True
+        else:
+            out.append(ch)
+            out_len += 1
+            prev_space = False
+
+    # Flush a trailing string (closed or truncated)
+    if pending_key or in_string:
+        words = ''.join(string_chars).split()
+        if words:
+            if not prev_space:
+                out.append(' ')
+            out.append(' '.join(words))
+
+    return ''.join(out).strip()
+
+def extract_json_object(text: str) -> Optional[str]:
     """
-    Clean JSON response to extract human-readable text only
+    Return the first balanced {...} object in text (braces inside strings are
+    ignored), or None. One forward scan, no regex backtracking
     """
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Readable parts whose leading text is at least this similar are treated as duplicates
+_NEAR_DUPLICATE_RATIO = 0.85
+_NEAR_DUPLICATE_PREFIX = 200
+
+def _drop_near_duplicates(parts: list[str]) -> list[str]:
+    """Keep only the first of any parts that repeat each other (compares prefixes only)"""
+    kept: list[str] = []
+    for part in parts:
+        prefix = part[:_NEAR_DUPLICATE_PREFIX]
+        if not any(
+            difflib.SequenceMatcher(None, prefix, other[:_NEAR_DUPLICATE_PREFIX]).ratio() > _NEAR_DUPLICATE_RATIO
+            for other in kept
+        ):
+            kept.append(part)
+    return kept
+
+# Gemini replies repeat (cached replies, retried submissions), and cleaning is a pure
+# function of the text, so recent results are kept
+@lru_cache(maxsize=256)
+def clean_json_response(response_text: str, max_len: Optional[int] = None) -> str:
+    """
+    Clean JSON response to extract human-readable text only. With max_len, the
+    result is cut to max_len chars and character-level cleaning stops early
+    """
+    cleaned = _clean_json_response(response_text, -1 if max_len is None else max_len)
+    return cleaned if max_len is None else cleaned[:max_len]
+
+def _clean_json_response(response_text: str, limit: int) -> str:
+    # Fast path: plain prose has no JSON or code fences, so skip all cleaning
+    stripped = response_text.strip()
+    if not stripped:
+        return "Analysis completed."
+    if not any(marker in stripped for marker in _JSON_MARKERS):
+        return stripped
+    
     # Remove code blocks
-    response_text = re.sub(r'```json\s*', '', response_text)
-    response_text = re.sub(r'```\s*', '', response_text)
+    if '`' in stripped:
+        response_text = _CODE_FENCE_RE.sub('', response_text)
+    
+    # Only a JSON object can be flattened, so prose with embedded JSON (or a
+    # bare array) skips the doomed parse attempt
+    parsed_json = None
+    if response_text.lstrip().startswith('{'):
+        try:
+            parsed_json = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            pass
     
-    try:
-        # Try to parse as JSON first
-        parsed_json = json.loads(response_text)
+    # Extract meaningful content from JSON
+    if isinstance(parsed_json, dict):
+        # Extract summary or detailed analysis
+        readable_parts = []
+        
+        for key in ['summary', 'detailed_analysis', 'analysis', 'explanation', 'description']:
+            if key in parsed_json and parsed_json[key]:
+                readable_parts.append(str(parsed_json[key]))
         
-        # Extract meaningful content from JSON
-        if isinstance(parsed_json, dict):
-            # Extract summary or detailed analysis
-            readable_parts = []
-            
-            for key in ['summary', 'detailed_analysis', 'analysis', 'explanation', 'description']:
-                if key in parsed_json and parsed_json[key]:
-                    readable_parts.append(str(parsed_json[key]))
-            
-            # Extract evidence points
-            if 'key_evidence_points' in parsed_json and parsed_json['key_evidence_points']:
-                evidence = ', '.join(parsed_json['key_evidence_points'])
-                readable_parts.append(f"Evidence: {evidence}")
-            
-            # Extract credibility assessment
-            if 'credibility_assessment' in parsed_json and parsed_json['credibility_assessment']:
-                readable_parts.append(f"Credibility: {parsed_json['credibility_assessment']}")
-            
-            return '. '.join(readable_parts) if readable_parts else response_text
+        # Extract evidence points
+        if 'key_evidence_points' in parsed_json and parsed_json['key_evidence_points']:
+            evidence = ', '.join(parsed_json['key_evidence_points'])
+            readable_parts.append(f"Evidence: {evidence}")
         
-    except json.JSONDecodeError:
-        pass
+        # Extract credibility assessment
+        if 'credibility_assessment' in parsed_json and parsed_json['credibility_assessment']:
+            readable_parts.append(f"Credibility: {parsed_json['credibility_assessment']}")
+        
+        return '. '.join(_drop_near_duplicates(readable_parts)) if readable_parts else response_text
     
-    # If not JSON or parsing failed, clean up the text
-    # Remove common JSON artifacts
-    cleaned = re.sub(r'\{[^}]*\}', '', response_text)  # Remove JSON objects
-    cleaned = re.sub(r'\[[^\]]*\]', '', cleaned)      # Remove JSON arrays
-    cleaned = re.sub(r'"[^"]*":', '', cleaned)        # Remove JSON keys
-    cleaned = re.sub(r'[:,\{\}\[\]"]', ' ', cleaned)  # Remove JSON punctuation
-    cleaned = re.sub(r'\s+', ' ', cleaned)            # Normalize whitespace
-    cleaned = cleaned.strip()
+    # If not JSON or parsing failed, strip JSON artifacts in one pass
+    cleaned = _strip_json_artifacts(response_text, limit)
     
     return cleaned if cleaned else "Analysis completed."
 
@@ -58,4 +275,46 @@ if __name__ == "__main__":
     }
     '''
     
-    print(clean_json_response(test_json))
\ No newline at end of file
+    print(clean_json_response(test_json))
+
+    # Regression cases: (input, expected cleaned text)
+    cases = [
+        # Plain prose is returned untouched
+        ("The claim is false according to WHO.", "The claim is false according to WHO."),
+        # Fenced JSON is unwrapped and flattened to its readable fields
+        ('```json\n{"summary": "Vaccines are safe.", "verdict": "Supported"}\n```', "Vaccines are safe."),
+        # Objects and arrays embedded in prose are dropped whole, including nested ones
+        ('Result: {"verdict": "False", "details": {"a": 1}} The claim is unsupported.', "Result The claim is unsupported."),
+        ('[1, 2] Findings {"x": {"y": [1]}} remain unclear', "Findings remain unclear"),
+        # A truncated (never closed) object is salvaged rather than dropped
+        ('{"summary": "Partial analysis of the claim', "Partial analysis of the claim"),
+        # Top-level keys are stripped; a quoted word that isn't a key keeps its text
+        ('"verdict": "False", "summary": "The claim is misleading"', "False The claim is misleading"),
+        ('He said "hello world" to everyone {"score": 3}', "He said hello world to everyone"),
+        ("", "Analysis completed."),
+    ]
+    for text, expected in cases:
+        assert clean_json_response(text) == expected, (text, clean_json_response(text))
+
+    # max_len stops cleaning early but must agree with the full output truncated
+    long_text = 'The claim "x" is partly wrong, see {"k": [1, 2]} and "note": more words here. ' * 20
+    full = clean_json_response(long_text)
+    for n in range(len(full) + 5):
+        assert clean_json_response(long_text, max_len=n) == full[:n], n
+
+    # Deeply nested, never-closed brackets are cleaned in linear time
+    import time
+    for pathological in ("[" * 16000, '{"a": ' * 2666, "{" * 100000):
+        for limit in (None, 200):
+            started = time.perf_counter()
+            clean_json_response(pathological, max_len=limit)
+            elapsed = time.perf_counter() - started
+            assert elapsed < 0.5, (pathological[:10], limit, elapsed)
+
+    # With max_len, brackets past the cut-off are never matched
+    long_reply = 'Claim text here {"k": [1, 2]} more prose. ' * 5000
+    assert clean_json_response(long_reply, max_len=200) == clean_json_response(long_reply)[:200]
+
+    assert extract_json_object('noise {"a": "}", "b": {"c": 1}} tail') == '{"a": "}", "b": {"c": 1}}'
+    assert extract_json_object("no object here") is None
+    print("json_cleaner: all regression cases passed")
\ No newline at end of file
@@ -0,0 +1,31 @@
+# Local check run before any Gemini call. It only rejects input that can't hold a
+# claim at all: word counts, capitalisation and keyword heuristics misjudge short
+# claims and scripts without spaces (Chinese, Japanese) or case (Hindi), and a false
+# "insufficient information" verdict costs more than the Gemini call it saves
+
+# Shortest input (in characters, after stripping) worth sending to Gemini;
+# CJK claims such as "地球是圆的" are only a handful of characters long
+MIN_CLAIM_CHARS = 5
+
+def is_verifiable(text: str) -> bool:
+    """Whether text is long enough, and has any letters or digits, to possibly contain a claim"""
+    stripped = text.strip()
+    return len(stripped) >= MIN_CLAIM_CHARS and any(ch.isalnum() for ch in stripped)
+
+
+# Regression cases
+if __name__ == "__main__":
+    verifiable = [
+        "the earth is round and orbits the sun",
+        "vaccines contain microchips",
+        "पृथ्वी सूर्य के चारों ओर घूमती है",
+        "地球是圆的",
+        "中国的长城是世界上最长的城墙，全长超过两万公里，始建于公元前七世纪，历经多个朝代的修建和扩建，是人类历史上最伟大的建筑工程之一，也是联合国教科文组织认定的世界文化遗产。",
+        "The Eiffel Tower is in Paris",
+    ]
+    unverifiable = ["", "   ", "ok", "hi!", "?!?!?!", "...  ..."]
+    for text in verifiable:
+        assert is_verifiable(text), text
+    for text in unverifiable:
+        assert not is_verifiable(text), text
+    print("prefilter: all regression cases passed")